@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, route_class: str, reason: str, retry_after: int):
+        super().__init__(f"{route_class}: {reason}")
+        self.route_class = route_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RouteLimiter:
+    """Admission control for one route class.
+
+    At most ``max_in_flight`` requests run at once and at most ``max_queue`` wait for a slot.
+    A waiting request that is not admitted within ``queue_timeout`` seconds is shed.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, queue_timeout: float, retry_after: int = 1):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.total_queue_time = 0.0
+        self.max_queue_time = 0.0
+
+    async def acquire(self) -> float:
+        """Wait for a free slot.
+
+        Returns:
+            float: Seconds spent in the queue.
+
+        Raises:
+            Overloaded: If the queue is full or the queue deadline passes.
+        """
+        start = time.perf_counter()
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        elif self.queued >= self.max_queue:
+            self.shed_queue_full += 1
+            raise Overloaded(self.name, "queue full", self.retry_after)
+        else:
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.shed_timeout += 1
+                raise Overloaded(self.name, "queue deadline exceeded", self.retry_after)
+            finally:
+                self.queued -= 1
+
+        queue_time = time.perf_counter() - start
+        self.in_flight += 1
+        self.admitted += 1
+        self.total_queue_time += queue_time
+        self.max_queue_time = max(self.max_queue_time, queue_time)
+        return queue_time
+
+    def release(self) -> None:
+        """Free the slot taken by ``acquire``."""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        """Current load and lifetime counters for this route class."""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed_queue_full + self.shed_timeout,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+            "avg_queue_time_ms": round(self.total_queue_time / self.admitted * 1000, 3) if self.admitted else 0.0,
+            "max_queue_time_ms": round(self.max_queue_time * 1000, 3),
+        }
+
+
+class AdmissionController:
+    """Maps request paths to route classes, each guarded by its own ``RouteLimiter``.
+
+    Paths that are not listed in ``routes`` (health checks, stats) are never limited.
+    """
+
+    def __init__(self, limiters: list, routes: dict):
+        self.limiters = {limiter.name: limiter for limiter in limiters}
+        self.routes = routes
+
+    def limiter_for(self, path: str) -> Optional[RouteLimiter]:
+        route_class = self.routes.get(path)
+        return self.limiters[route_class] if route_class else None
+
+    def stats(self) -> dict:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+class AdmissionMiddleware:
+    """Shed requests over capacity with ``503 Service Unavailable`` and a ``Retry-After`` header."""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = self.controller.limiter_for(scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except Overloaded as err:
+            logger.warning(f"Shedding {scope['method']} {scope['path']}: {err}")
+            response = JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                    content={"detail": "Service is overloaded, please retry later"},
+                                    headers={"Retry-After": str(err.retry_after)})
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -2,19 +2,33 @@ import logging
 from datetime import datetime
 
 import uvicorn
-from fastapi import FastAPI, Header, status, Depends, HTTPException
+from fastapi import FastAPI, Header, Request, Response, status, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from admission import AdmissionController, AdmissionMiddleware, RouteLimiter
 from database import get_db
 from log_config import setup_logging
 from models import User, init_db
+from response_cache import CachedResponse, ResponseCacheMiddleware
 from utils import hash_password, verify_password, create_token, get_current_user
 
 setup_logging()
 logger = logging.getLogger(__name__)
 app = FastAPI()
 init_db()
+health_response = CachedResponse({"message": "Auth Service is up and running!"})
+
+# Signup and login are bound by bcrypt, so they get a small pool of their own
+admission = AdmissionController(
+    limiters=[
+        RouteLimiter("credentials", max_in_flight=4, max_queue=16, queue_timeout=2.0),
+        RouteLimiter("token", max_in_flight=32, max_queue=64, queue_timeout=1.0),
+    ],
+    routes={"/signup": "credentials", "/login": "credentials", "/validate-token": "token"},
+)
+app.add_middleware(AdmissionMiddleware, controller=admission)
+app.add_middleware(ResponseCacheMiddleware, routes={"/": health_response})
 
 
 # Pydantic models for user data
@@ -29,8 +43,8 @@ class SignupUser(LoginUser):
 
 
 @app.post("/signup", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def signup(user: SignupUser, db: Session = Depends(get_db)) -> dict:
-    """Create a new user."""
+def signup(user: SignupUser, db: Session = Depends(get_db)) -> dict:
+    """Create a new user. Runs in the threadpool so bcrypt does not block the event loop."""
     try:
         if db.query(User).filter(User.username == user.username).first():
             error_message = f"Username: {user.username}, already registered"
@@ -64,8 +78,8 @@ async def signup(user: SignupUser, db: Session = Depends(get_db)) -> dict:
 
 
 @app.post("/login", response_model=dict, status_code=status.HTTP_200_OK)
-async def login(user: LoginUser, db: Session = Depends(get_db)) -> dict:
-    """Authenticate a user and return tokens."""
+def login(user: LoginUser, db: Session = Depends(get_db)) -> dict:
+    """Authenticate a user and return tokens. Runs in the threadpool so bcrypt does not block the event loop."""
     try:
 
         db_user = db.query(User).filter(User.username == user.username).first()
@@ -121,10 +135,16 @@ async def validate_token(token: str = Header(...), db: Session = Depends(get_db)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An error occurred during login.")
 
 
+@app.get("/admission-stats", response_model=dict, status_code=status.HTTP_200_OK)
+async def admission_stats() -> dict:
+    """In-flight, queued and shed request counts per route class."""
+    return admission.stats()
+
+
 # Health check endpoint
 @app.get("/")
-def read_root():
-    return {"message": "Auth Service is up and running!"}
+async def read_root(request: Request) -> Response:
+    return health_response.to_response(request)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import logging
+import time
+
+from message_service import app as message_app, message_cache
+
+ITERATIONS = 20000
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+
+
+async def call_app(app, method, path, query_string=b"", body=b"", headers=()):
+    """Send a single request straight to an ASGI app, skipping any HTTP client overhead."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status_code = None
+
+    async def receive():
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "http",
+        "method": method, "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query_string, "headers": [(b"content-type", b"application/json"), *headers],
+        "server": ("benchmark", 80), "client": ("benchmark", 12345),
+    }
+    await app(scope, receive, send)
+    return status_code
+
+
+async def benchmark(name, call, iterations=ITERATIONS):
+    """Time a request coroutine and log the per-request latency."""
+    await call()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        status_code = await call()
+    elapsed = time.perf_counter() - start
+    logging.info(f"{name:<40} {elapsed / iterations * 1_000_000:8.1f} us/request  (status {status_code})")
+    return elapsed
+
+
+async def benchmark_message_service():
+    """Compare the POST /get-message path with the cached GET and its conditional variant."""
+    body = json.dumps({"is_valid": True, "is_admin": True}).encode()
+    query = b"is_valid=true&is_admin=true"
+    if_none_match = (b"if-none-match", message_cache["admin"].etag.encode())
+
+    baseline = await benchmark("POST /get-message (validated)",
+                               lambda: call_app(message_app, "POST", "/get-message", body=body))
+    cached = await benchmark("GET /get-message (cache hit)",
+                             lambda: call_app(message_app, "GET", "/get-message", query_string=query))
+    not_modified = await benchmark("GET /get-message (If-None-Match, 304)",
+                                   lambda: call_app(message_app, "GET", "/get-message", query_string=query,
+                                                    headers=[if_none_match]))
+    await benchmark("GET / (cached health check)", lambda: call_app(message_app, "GET", "/"))
+
+    logging.info(f"Cache hit speed-up: {baseline / cached:.2f}x, 304 speed-up: {baseline / not_modified:.2f}x")
+
+
+if __name__ == '__main__':
+    asyncio.run(benchmark_message_service())
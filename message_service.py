@@ -1,9 +1,12 @@
 import logging
+from typing import Optional
 
 import uvicorn
-from fastapi import FastAPI, Request, HTTPException, status
+from fastapi import FastAPI, Request, Response, HTTPException, status
 
+from admission import AdmissionController, AdmissionMiddleware, RouteLimiter
 from log_config import setup_logging
+from response_cache import CachedResponse, ResponseCache, ResponseCacheMiddleware
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -17,6 +20,52 @@ messages = {
     "guest": "Access denied. Invalid user."
 }
 
+# Encoded once at startup; every request for a role is served from these bytes
+message_cache = ResponseCache({role: {"message": message} for role, message in messages.items()})
+health_response = CachedResponse({"message": "Message Service is up and running!"})
+
+
+def resolve_role(is_valid: bool, is_admin: bool) -> str:
+    """Map the token validation result to a message role."""
+    if not is_valid:
+        return "guest"
+    return "admin" if is_admin else "user"
+
+
+def lookup_cached_message(request: Request) -> Optional[CachedResponse]:
+    """Resolve a /get-message request straight from its query string.
+
+    Returns None for anything other than plain true/false flags, leaving those to the route.
+    """
+    flags = {"true": True, "false": False}
+    is_valid = flags.get(request.query_params.get("is_valid", "").lower())
+    is_admin = flags.get(request.query_params.get("is_admin", "").lower())
+    if is_valid is None or is_admin is None:
+        return None
+    return message_cache[resolve_role(is_valid, is_admin)]
+
+
+admission = AdmissionController(
+    limiters=[RouteLimiter("message", max_in_flight=64, max_queue=128, queue_timeout=1.0)],
+    routes={"/get-message": "message"},
+)
+app.add_middleware(AdmissionMiddleware, controller=admission)
+# Added last so cache hits are answered before admission control
+app.add_middleware(ResponseCacheMiddleware, routes={
+    "/": health_response,
+    "/get-message": lookup_cached_message,
+})
+
+
+@app.get("/get-message", status_code=status.HTTP_200_OK)
+async def get_cached_message(request: Request, is_valid: bool, is_admin: bool) -> Response:
+    """
+    Get the cached message for a role, with ETag / If-None-Match support.
+    - is_valid: Indicates whether the user is valid.
+    - is_admin: Indicates if the user is an admin.
+    """
+    return message_cache.respond(resolve_role(is_valid, is_admin), request)
+
 
 @app.post("/get-message", response_model=dict, status_code=status.HTTP_200_OK)
 async def get_message(request: Request) -> dict:
@@ -37,23 +86,23 @@ async def get_message(request: Request) -> dict:
         if is_admin is None:
             raise HTTPException(status_code=400, detail="Missing 'is_admin' field")
 
-        if is_valid:
-            if is_admin:
-                return {"message": messages["admin"]}
-            else:
-                return {"message": messages["user"]}
-        else:
-            return {"message": messages["guest"]}
+        return {"message": messages[resolve_role(is_valid, is_admin)]}
 
     except Exception as err:
         logger.error(f"Error processing message: {err}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {err}")
 
 
+@app.get("/admission-stats", response_model=dict, status_code=status.HTTP_200_OK)
+async def admission_stats() -> dict:
+    """In-flight, queued and shed request counts per route class."""
+    return admission.stats()
+
+
 # Health check endpoint
 @app.get("/")
-def read_root():
-    return {"message": "Message Service is up and running!"}
+async def read_root(request: Request) -> Response:
+    return health_response.to_response(request)
 
 
 if __name__ == '__main__':
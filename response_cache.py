@@ -0,0 +1,108 @@
+import hashlib
+import json
+from typing import Callable, Optional, Union
+
+from fastapi import Request, Response, status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class CachedResponse:
+    """A JSON response encoded once and served with an ETag.
+
+    The body is serialised the same way FastAPI's ``JSONResponse`` does it, so clients
+    see identical bytes whether a route returns a dict or a cached response.
+    """
+
+    def __init__(self, content: dict, cache_control: str = "no-cache"):
+        self.content = content
+        self.body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                               separators=(",", ":")).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.headers = {"ETag": self.etag, "Cache-Control": cache_control}
+
+    def is_fresh(self, if_none_match: Optional[str]) -> bool:
+        """Check an ``If-None-Match`` header value against this response's ETag.
+
+        Args:
+            if_none_match (Optional[str]): The raw header value, if any.
+
+        Returns:
+            bool: True if the client already holds the current representation.
+        """
+        if not if_none_match:
+            return False
+
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+    def to_response(self, request: Request) -> Response:
+        """Build the response for a request, honouring conditional GET.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            Response: ``304 Not Modified`` if the client's copy is current, otherwise the cached body.
+        """
+        if self.is_fresh(request.headers.get("if-none-match")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+
+
+class ResponseCache:
+    """Precomputed responses for a fixed catalog of payloads, looked up by key."""
+
+    def __init__(self, catalog: dict, cache_control: str = "no-cache"):
+        self._responses = {key: CachedResponse(content, cache_control) for key, content in catalog.items()}
+
+    def __getitem__(self, key: str) -> CachedResponse:
+        return self._responses[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._responses
+
+    def respond(self, key: str, request: Request) -> Response:
+        """Serve the cached response stored under ``key``.
+
+        Args:
+            key (str): The catalog key.
+            request (Request): The incoming request.
+
+        Returns:
+            Response: The cached (or ``304``) response.
+
+        Raises:
+            KeyError: If ``key`` is not in the catalog.
+        """
+        return self._responses[key].to_response(request)
+
+
+CacheLookup = Union[CachedResponse, Callable[[Request], Optional[CachedResponse]]]
+
+
+class ResponseCacheMiddleware:
+    """Serve cached GET responses before routing and request validation run.
+
+    ``routes`` maps a path to either a ``CachedResponse`` or a callable that picks one from
+    the request. A callable may return None to let the request fall through to the app,
+    so the regular route still handles validation errors and unusual inputs.
+    """
+
+    def __init__(self, app: ASGIApp, routes: dict):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] == "GET":
+            lookup: Optional[CacheLookup] = self.routes.get(scope["path"])
+            if lookup is not None:
+                request = Request(scope)
+                cached = lookup if isinstance(lookup, CachedResponse) else lookup(request)
+                if cached is not None:
+                    await cached.to_response(request)(scope, receive, send)
+                    return
+
+        await self.app(scope, receive, send)
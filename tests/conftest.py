@@ -0,0 +1,177 @@
+"""In-process harness wiring the three services together without opening any ports.
+
+- The auth service talks to an in-memory SQLite database, with every query counted.
+- The user service reaches the auth and message services through ``UpstreamStub`` transports,
+  which forward to the real apps over ASGI, record each call and can inject latency or faults.
+"""
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+# Must be set before the services are imported, so importing them never touches database.db
+os.environ["SQLALCHEMY_DATABASE_URL"] = "sqlite://"
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import auth_service
+import message_service
+import user_service
+from database import get_db
+from models import Base, User
+from utils import hash_password, create_token
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class QueryCounter:
+    """Records every SQL statement executed on an engine."""
+
+    def __init__(self, engine):
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+
+class UpstreamStub(httpx.AsyncBaseTransport):
+    """Stand-in for an upstream service that forwards to its ASGI app in-process.
+
+    Set ``latency`` (seconds) to delay every call, ``fail_with`` to answer with that status code
+    instead of calling the app, or ``error`` to raise a transport error such as ``httpx.ConnectError``.
+    """
+
+    def __init__(self, app):
+        self._transport = httpx.ASGITransport(app=app)
+        self.calls = []
+        self.latency = 0.0
+        self.fail_with = None
+        self.error = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append((request.method, request.url.path))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        if self.fail_with is not None:
+            return httpx.Response(self.fail_with, json={"detail": "Injected fault"}, headers={"Retry-After": "3"})
+        return await self._transport.handle_async_request(request)
+
+    def call_count(self, method: str, path: str) -> int:
+        return self.calls.count((method, path))
+
+
+class ServiceRouter(httpx.AsyncBaseTransport):
+    """Routes outgoing requests to the stub registered for their host and port."""
+
+    def __init__(self, routes: dict):
+        self.routes = {httpx.URL(url).netloc: stub for url, stub in routes.items()}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.routes[request.url.netloc].handle_async_request(request)
+
+
+@pytest.fixture
+def db_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def query_counter(db_engine):
+    return QueryCounter(db_engine)
+
+
+@pytest.fixture
+def auth_app(db_engine):
+    testing_session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+    def override_get_db():
+        db = testing_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    auth_service.app.dependency_overrides[get_db] = override_get_db
+    yield auth_service.app
+    auth_service.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def upstreams(auth_app):
+    return SimpleNamespace(auth=UpstreamStub(auth_app), message=UpstreamStub(message_service.app))
+
+
+@pytest.fixture
+async def user_client(upstreams):
+    router = ServiceRouter({
+        user_service.AUTH_SERVICE_URL: upstreams.auth,
+        user_service.MESSAGE_SERVICE_URL: upstreams.message,
+    })
+    async with httpx.AsyncClient(transport=router) as http_client:
+        user_service.app.dependency_overrides[user_service.get_http_client] = lambda: http_client
+        transport = httpx.ASGITransport(app=user_service.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://user-service") as client:
+            yield client
+    user_service.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def message_client():
+    transport = httpx.ASGITransport(app=message_service.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://message-service") as client:
+        yield client
+
+
+@pytest.fixture
+def create_user(db_session):
+    """Insert a user directly and return a valid access token for it."""
+
+    def _create_user(username: str, is_admin: bool = False, password: str = "password") -> str:
+        db_session.add(User(username=username, email=f"{username}@email.com",
+                            password=hash_password(password), is_admin=is_admin))
+        db_session.commit()
+        return create_token(username)["access_token"]
+
+    return _create_user
+
+
+@pytest.fixture
+def latency_budget():
+    """Fail the test if the block takes longer than ``seconds``."""
+
+    @contextmanager
+    def _latency_budget(seconds: float):
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        assert elapsed <= seconds, f"Took {elapsed * 1000:.1f} ms, budget is {seconds * 1000:.0f} ms"
+
+    return _latency_budget
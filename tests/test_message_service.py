@@ -0,0 +1,72 @@
+import pytest
+
+import message_service
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("is_valid, is_admin, role", [
+    ("true", "true", "admin"),
+    ("true", "false", "user"),
+    ("false", "true", "guest"),
+    ("False", "False", "guest"),
+])
+async def test_get_message(message_client, is_valid, is_admin, role):
+    response = await message_client.get("/get-message", params={"is_valid": is_valid, "is_admin": is_admin})
+
+    assert response.status_code == 200
+    assert response.json() == {"message": message_service.messages[role]}
+    assert response.headers["ETag"] == message_service.message_cache[role].etag
+
+
+async def test_get_message_not_modified(message_client):
+    params = {"is_valid": "true", "is_admin": "true"}
+    etag = (await message_client.get("/get-message", params=params)).headers["ETag"]
+
+    response = await message_client.get("/get-message", params=params, headers={"If-None-Match": f"W/{etag}"})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+async def test_get_message_stale_etag(message_client):
+    admin_etag = message_service.message_cache["admin"].etag
+
+    response = await message_client.get("/get-message", params={"is_valid": "true", "is_admin": "false"},
+                                        headers={"If-None-Match": admin_etag})
+
+    assert response.status_code == 200
+    assert response.json() == {"message": message_service.messages["user"]}
+
+
+async def test_cache_hits_skip_the_route(message_client):
+    limiter = message_service.admission.limiters["message"]
+    admitted = limiter.admitted
+
+    for _ in range(5):
+        await message_client.get("/get-message", params={"is_valid": "true", "is_admin": "true"})
+
+    assert limiter.admitted == admitted
+
+
+async def test_get_message_falls_through_to_validation(message_client):
+    response = await message_client.get("/get-message", params={"is_valid": "1", "is_admin": "no"})
+    assert response.json() == {"message": message_service.messages["user"]}
+
+    response = await message_client.get("/get-message", params={"is_valid": "maybe"})
+    assert response.status_code == 422
+
+
+async def test_post_get_message(message_client):
+    response = await message_client.post("/get-message", json={"is_valid": True, "is_admin": False})
+
+    assert response.status_code == 200
+    assert response.json() == {"message": message_service.messages["user"]}
+
+
+async def test_health_check(message_client):
+    response = await message_client.get("/")
+
+    assert response.json() == {"message": "Message Service is up and running!"}
+    assert "ETag" in response.headers
@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+import message_service
+import user_service
+from admission import RouteLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("is_admin, role", [(True, "admin"), (False, "user")])
+async def test_user_message(user_client, upstreams, create_user, query_counter, latency_budget, is_admin, role):
+    token = create_user("test_user", is_admin=is_admin)
+    query_counter.reset()
+
+    with latency_budget(0.25):
+        response = await user_client.get("/user/message", headers={"Authorization": token})
+
+    assert response.status_code == 200
+    assert response.json()["detail"] == message_service.messages[role]
+    assert upstreams.auth.calls == [("POST", "/validate-token")]
+    assert upstreams.message.calls == [("GET", "/get-message")]
+    assert query_counter.count == 1
+
+
+async def test_user_message_without_token(user_client, upstreams):
+    response = await user_client.get("/user/message")
+
+    assert response.json()["status_code"] == 400
+    assert upstreams.auth.calls == []
+    assert upstreams.message.calls == []
+
+
+async def test_user_message_with_invalid_token(user_client, upstreams):
+    response = await user_client.get("/user/message", headers={"Authorization": "not-a-token"})
+
+    assert response.status_code == 500
+    assert response.json()["detail"].startswith("Auth service error")
+    assert upstreams.message.calls == []
+
+
+async def test_login(user_client, upstreams, create_user, query_counter, latency_budget):
+    create_user("normal_user", password="normal_user_password")
+    query_counter.reset()
+
+    with latency_budget(2.0):
+        response = await user_client.post("/user/login",
+                                          json={"username": "normal_user", "password": "normal_user_password"})
+
+    assert response.status_code == 200
+    assert response.json()["detail"]["token_type"] == "bearer"
+    assert upstreams.auth.calls == [("POST", "/login")]
+    assert query_counter.count == 1
+
+
+async def test_signup(user_client, upstreams, query_counter, latency_budget):
+    new_user = {"username": "admin_user", "password": "admin_user_password",
+                "email": "admin_user@email.com", "is_admin": True}
+
+    with latency_budget(2.0):
+        response = await user_client.post("/user/signup", json=new_user)
+
+    assert response.status_code == 201
+    assert upstreams.auth.calls == [("POST", "/signup")]
+    # Username check, email check, insert and the refresh after commit
+    assert query_counter.count == 4
+
+
+async def test_auth_service_unreachable(user_client, upstreams, create_user):
+    token = create_user("test_user")
+    upstreams.auth.error = httpx.ConnectError("Connection refused")
+
+    response = await user_client.get("/user/message", headers={"Authorization": token})
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Auth service error: Connection refused"
+    assert upstreams.message.calls == []
+
+
+async def test_upstream_overload_is_passed_through(user_client, upstreams, create_user):
+    token = create_user("test_user")
+    upstreams.message.fail_with = 503
+
+    response = await user_client.get("/user/message", headers={"Authorization": token})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+
+async def test_requests_over_capacity_are_shed(user_client, upstreams, create_user, monkeypatch, latency_budget):
+    token = create_user("test_user")
+    limiter = RouteLimiter("message", max_in_flight=2, max_queue=2, queue_timeout=0.05)
+    monkeypatch.setitem(user_service.admission.limiters, "message", limiter)
+    upstreams.auth.latency = 0.2
+
+    with latency_budget(0.5):
+        responses = await asyncio.gather(*[
+            user_client.get("/user/message", headers={"Authorization": token}) for _ in range(10)
+        ])
+
+    status_codes = [response.status_code for response in responses]
+    assert status_codes.count(200) == 2
+    assert status_codes.count(503) == 8
+    assert all(response.headers["Retry-After"] == "1" for response in responses if response.status_code == 503)
+    # Shed requests never reach the upstream services
+    assert upstreams.auth.call_count("POST", "/validate-token") == 2
+    assert limiter.stats()["shed_queue_full"] == 6
+    assert limiter.stats()["shed_timeout"] == 2
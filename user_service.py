@@ -1,23 +1,52 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
 
-import requests
+import httpx
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import status, FastAPI, Header, HTTPException
+from fastapi import status, FastAPI, Depends, Header, HTTPException, Request, Response
 from pydantic import BaseModel
 
+from admission import AdmissionController, AdmissionMiddleware, RouteLimiter
 from log_config import setup_logging
+from response_cache import CachedResponse, ResponseCacheMiddleware
 
 load_dotenv()
 setup_logging()
 logger = logging.getLogger(__name__)
 AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://localhost:8282/")
 MESSAGE_SERVICE_URL = os.getenv("MESSAGE_SERVICE_URL", "http://localhost:8383/")
+UPSTREAM_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", 5))
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared non-blocking client, so waiting on an upstream service does not stall the event loop
+    async with httpx.AsyncClient(timeout=UPSTREAM_TIMEOUT_SECONDS) as http_client:
+        app.state.http_client = http_client
+        yield
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
+
+
+app = FastAPI(lifespan=lifespan)
+health_response = CachedResponse({"message": "User Service is up and running!"})
+
+# Every route waits on the auth service, so keep the work in flight bounded
+admission = AdmissionController(
+    limiters=[
+        RouteLimiter("credentials", max_in_flight=8, max_queue=16, queue_timeout=2.0),
+        RouteLimiter("message", max_in_flight=32, max_queue=64, queue_timeout=1.0),
+    ],
+    routes={"/user/signup": "credentials", "/user/login": "credentials", "/user/message": "message"},
+)
+app.add_middleware(AdmissionMiddleware, controller=admission)
+app.add_middleware(ResponseCacheMiddleware, routes={"/": health_response})
 
 
 # Pydantic models for user data
@@ -31,16 +60,31 @@ class SignupUser(LoginUser):
     is_admin: bool
 
 
+def check_upstream(response: httpx.Response) -> None:
+    """Raise for an upstream error response.
+
+    An upstream that is shedding load (503) is passed through as a 503 with its Retry-After,
+    so clients back off instead of seeing a generic server error.
+    """
+    if response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Upstream service is overloaded, please retry later",
+                            headers={"Retry-After": response.headers.get("Retry-After", "1")})
+    response.raise_for_status()
+
+
 @app.post("/user/signup", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def user_signup(user: SignupUser) -> dict:
+async def user_signup(user: SignupUser, http_client: httpx.AsyncClient = Depends(get_http_client)) -> dict:
     try:
         new_user = user.model_dump()
 
-        auth_response = requests.post(f"{AUTH_SERVICE_URL}signup", json=new_user)
-        auth_response.raise_for_status()
+        auth_response = await http_client.post(f"{AUTH_SERVICE_URL}signup", json=new_user)
+        check_upstream(auth_response)
 
         logger.info(auth_response.json())
 
+    except HTTPException:
+        raise
     except Exception as err:
         logger.error(err, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Auth service error: {err}")
@@ -54,15 +98,17 @@ async def user_signup(user: SignupUser) -> dict:
 
 
 @app.post("/user/login", response_model=dict, status_code=status.HTTP_200_OK)
-async def login(user: LoginUser) -> dict:
+async def login(user: LoginUser, http_client: httpx.AsyncClient = Depends(get_http_client)) -> dict:
     try:
         user_details = user.model_dump()
 
-        auth_response = requests.post(f"{AUTH_SERVICE_URL}login", json=user_details)
-        auth_response.raise_for_status()
+        auth_response = await http_client.post(f"{AUTH_SERVICE_URL}login", json=user_details)
+        check_upstream(auth_response)
 
         logger.info(auth_response.json())
 
+    except HTTPException:
+        raise
     except Exception as err:
         logger.error(err, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Auth service error: {err}")
@@ -76,7 +122,8 @@ async def login(user: LoginUser) -> dict:
 
 
 @app.get("/user/message", response_model=dict, status_code=status.HTTP_200_OK)
-async def user_message(authorization: Optional[str] = Header(None)) -> dict:
+async def user_message(authorization: Optional[str] = Header(None),
+                       http_client: httpx.AsyncClient = Depends(get_http_client)) -> dict:
     if not authorization:
         date_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         return {
@@ -86,19 +133,20 @@ async def user_message(authorization: Optional[str] = Header(None)) -> dict:
         }
     # Validate token with Auth Service
     try:
-        auth_response = requests.post(f"{AUTH_SERVICE_URL}validate-token", headers={"token": authorization})
-        auth_response.raise_for_status()
+        auth_response = await http_client.post(f"{AUTH_SERVICE_URL}validate-token", headers={"token": authorization})
+        check_upstream(auth_response)
         is_valid = auth_response.json().get("is_valid", False)
         is_admin = auth_response.json().get("is_admin", False)
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"Auth service error: {e}")
 
     # Fetch message from Message Service
     try:
-        message_response = requests.post(f"{MESSAGE_SERVICE_URL}get-message",
-                                         json={"is_valid": is_valid, "is_admin": is_admin})
-        message_response.raise_for_status()
-    except requests.RequestException as e:
+        message_response = await http_client.get(f"{MESSAGE_SERVICE_URL}get-message",
+                                                 params={"is_valid": str(is_valid).lower(),
+                                                         "is_admin": str(is_admin).lower()})
+        check_upstream(message_response)
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"Message service error: {e}")
 
     date_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -109,10 +157,16 @@ async def user_message(authorization: Optional[str] = Header(None)) -> dict:
     }
 
 
+@app.get("/admission-stats", response_model=dict, status_code=status.HTTP_200_OK)
+async def admission_stats() -> dict:
+    """In-flight, queued and shed request counts per route class."""
+    return admission.stats()
+
+
 # Health check endpoint
 @app.get("/")
-def read_root():
-    return {"message": "User Service is up and running!"}
+async def read_root(request: Request) -> Response:
+    return health_response.to_response(request)
 
 
 if __name__ == '__main__':